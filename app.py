@@ -31,15 +31,38 @@ if not os.path.exists(DB_FILE) or 'db_initialized' not in st.session_state:
         init_db()
         st.success("資料庫已建立/確認！")
 
+# ── 讀取歷史資料（快取）──
+@st.cache_data(max_entries=1, show_spinner=False)
+def load_history(db_mtime, db_size):
+    # db_mtime / db_size 只當快取鍵：scraper 寫入後檔案改變，快取自動失效
+    conn = sqlite3.connect(DB_FILE)
+    try:
+        hist = pd.read_sql_query("SELECT * FROM history", conn)
+    finally:
+        conn.close()
+
+    # 日期欄在快取內解析一次（scraper 固定寫入 %Y-%m-%d），之後 rerun 不再重複轉換
+    hist["日期"] = pd.to_datetime(hist["日期"], format="%Y-%m-%d", errors="coerce")
+
+    # 同一貨品/庫位每天重複一筆，轉 category 省記憶體
+    # 注意：之後對這些欄位 groupby 請加 observed=True，否則會列出所有類別組合（含空組）
+    for col in ("貨品代號", "貨品名稱", "單位", "庫位", "包裝_單位"):
+        hist[col] = hist[col].astype("category")
+    return hist
+
 # 現在再讀取
-conn = sqlite3.connect(DB_FILE)
 try:
-    df = pd.read_sql_query("SELECT * FROM history", conn)
+    db_stat = os.stat(DB_FILE)
+    db_key = (db_stat.st_mtime_ns, db_stat.st_size)
+    # 資料庫沒變就直接沿用本 session 的 df，省掉 cache_data 每次 rerun 的整表複製
+    # 注意：df 跨 rerun 共用，後續程式請勿就地修改
+    if st.session_state.get('history_key') != db_key:
+        st.session_state['history_df'] = load_history(*db_key)
+        st.session_state['history_key'] = db_key
+    df = st.session_state['history_df']
 except Exception as e:
     st.error(f"讀取資料庫失敗：{str(e)}")
     df = pd.DataFrame()  # 防崩潰
-finally:
-    conn.close()
 
 if df.empty:
     st.warning("目前資料庫無歷史記錄，請執行 scraper.py 至少一次來累積資料。")